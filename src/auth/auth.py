@@ -14,19 +14,40 @@ Functions:
     a list of files and notifies the client via WebSocket.
 """
 
+import hmac
 import os
+import stat
 import threading
 from http.server import SimpleHTTPRequestHandler
-from urllib.parse import parse_qs, urlparse, unquote
-import asyncio
+from urllib.parse import parse_qs, unquote
 import requests
 from src.config.config import AUTH_TOKEN, WEB_URL, DOWNLOAD_URL, LOG_URL, WINDOWS  # noqa
 from src.database.db_operations import DatabaseError, fetch_filtered_items
 from src.zip.zip import create_zip_from_files
-from src.server.socket import notify_client
+from src.server.socket import notify_client_threadsafe
 from src.logs.logger import LOGGER
 from src.database.db_operations import save_download_pending
 
+BEARER_PREFIX = 'Bearer '
+BEARER_PREFIX_LEN = len(BEARER_PREFIX)
+# Encoded once: compare_digest needs both sides as bytes, since the str
+# form raises TypeError on non-ASCII input (trivially attacker-supplied
+# via the Authorization header).
+AUTH_TOKEN_BYTES = (AUTH_TOKEN or '').encode()
+
+# Shared session so calls to the backend reuse one pooled TCP/TLS
+# connection instead of handshaking per request.
+SESSION = requests.Session()
+
+if WINDOWS:
+    def _is_drive_path(path):
+        """Check for a leading Windows drive spec like /C:/ or /C:\\."""
+        return path[1:3] in (':/', ':\\')
+else:
+    def _is_drive_path(path):  # pylint: disable=unused-argument
+        """Non-Windows hosts never serve drive-prefixed paths."""
+        return False
+
 
 class AuthHTTPRequestHandler(SimpleHTTPRequestHandler):
     """
@@ -44,203 +65,232 @@ class AuthHTTPRequestHandler(SimpleHTTPRequestHandler):
         """
         Handle GET requests with authorization and file handling.
         """
-        auth_header = self.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            self.send_response(401)
-            self.send_header('Content-Type', 'text/plain')
-            self.end_headers()
-            self.wfile.write(b'Missing or invalid Authorization header')
+        auth_header = self.headers.get('Authorization', '')
+        if not auth_header.startswith(BEARER_PREFIX):
+            self._send_error_text(
+                401, b'Missing or invalid Authorization header')
             return
 
-        token = auth_header.split('Bearer ')[1]
-        if token != AUTH_TOKEN:
-            self.send_response(401)
-            self.send_header('Content-Type', 'text/plain')
-            self.end_headers()
-            self.wfile.write(b'Unauthorized')
+        # Slice off the prefix in one pass; compare_digest keeps the token
+        # check constant-time.
+        token = auth_header[BEARER_PREFIX_LEN:]
+        if not hmac.compare_digest(token.encode(), AUTH_TOKEN_BYTES):
+            self._send_error_text(401, b'Unauthorized')
             return
 
-        parsed_path = urlparse(self.path)
-        if parsed_path.path == '/download':
-            query_params = parse_qs(parsed_path.query)
-            if 'directory' not in query_params:
-                self.send_response(400)
-                self.send_header('Content-Type', 'text/plain')
-                self.end_headers()
-                self.wfile.write(b'Missing directory parameter')
-                return
-
-            file_paths = query_params['directory'][0].split(',')
-
-            if not DOWNLOAD_URL:
-                self.send_response(500)
-                self.send_header('Content-Type', 'text/plain')
-                self.end_headers()
-                self.wfile.write(b'Missing DOWNLOAD_URL environment variable')
-                return
-
-            if not LOG_URL:
-                self.send_response(500)
-                self.send_header('Content-Type', 'text/plain')
-                self.end_headers()
-                self.wfile.write(b'Missing LOG_URL environment variable')
-                return
+        # One partition instead of a full urlparse: only path and query
+        # matter for dispatch, and GET requests carry no fragments here.
+        route, _, query = self.path.partition('?')
+        handler = self.ROUTES.get(route)
+        if handler is not None:
+            handler(self, query)
+        else:
+            self.serve_static(route)
 
-            user_token = self.headers.get('x-user-token')
+    def handle_download(self, query):
+        """
+        Handle /download: resolve the requested items and start zipping.
+        """
+        query_params = parse_qs(query)
+        if 'directory' not in query_params:
+            self._send_error_text(400, b'Missing directory parameter')
+            return
 
-            headers = {'Authorization': f'Bearer {user_token}'}
-            try:
-                response = requests.get(
-                    DOWNLOAD_URL, headers=headers, timeout=10)
-                response.raise_for_status()
+        # Deduplicate while keeping request order, so repeated IDs cost
+        # neither extra IN() entries nor extra zip members.
+        file_paths = list(dict.fromkeys(
+            query_params['directory'][0].split(',')))
 
-                filters = response.json().get('data')
+        if not DOWNLOAD_URL:
+            self._send_error_text(
+                500, b'Missing DOWNLOAD_URL environment variable')
+            return
 
-                try:
-                    results = fetch_filtered_items(file_paths, filters)
+        if not LOG_URL:
+            self._send_error_text(500, b'Missing LOG_URL environment variable')
+            return
 
-                    list_original = [item[0] for item in results]
-                    list_preview = [item[2] for item in results]
-                    list_of_ids = [item[1] for item in results]
+        user_token = self.headers.get('x-user-token')
 
-                    mode = query_params.get('mode', ['original'])[0]
+        headers = {'Authorization': f'Bearer {user_token}'}
+        try:
+            response = SESSION.get(
+                DOWNLOAD_URL, headers=headers, timeout=10)
+            response.raise_for_status()
 
-                    list_of_files = list_original if mode == 'original' else list_preview  # noqa
-                    list_not_found = [
-                        item for item in file_paths if item not in list_of_ids]
+            filters = response.json().get('data')
 
-                    if not list_of_files:
-                        self.send_response(404)
-                        self.send_header('Content-Type', 'text/plain')
-                        self.end_headers()
-                        self.wfile.write(b'No files found')
-                        return
+            try:
+                results = fetch_filtered_items(file_paths, filters)
+
+                mode = query_params.get('mode', ['original'])[0]
+                # One pass over the rows instead of three comprehensions;
+                # only the requested variant's path list is materialized.
+                path_index = 0 if mode == 'original' else 2
+                list_of_files = []
+                list_of_ids = []
+                for item in results:
+                    list_of_files.append(item[path_index])
+                    # register_uuid makes the id column come back as
+                    # uuid.UUID; the request ids and the log payload
+                    # are strings, so normalize here.
+                    list_of_ids.append(str(item[1]))
+
+                found_ids = set(list_of_ids)
+                list_not_found = [
+                    item for item in file_paths if item not in found_ids]
+
+                if not list_of_files:
+                    self._send_error_text(404, b'No files found')
+                    return
 
-                    if list_not_found:
-                        self.send_response(404)
-                        self.send_header('Content-Type', 'text/plain')
-                        self.end_headers()
-                        self.wfile.write(f'Files not found: {
-                                         list_not_found}'.encode('utf-8'))
-                        return
+                if list_not_found:
+                    self._send_error_text(
+                        404, f'Files not found: {list_not_found}'.encode())
+                    return
 
-                    threading.Thread(target=self.handle_zip_creation, args=(
-                        list_of_files, query_params)).start()
+                threading.Thread(target=self.handle_zip_creation, args=(
+                    list_of_files, query_params)).start()
 
-                    client_id = query_params.get('client', [None])[0]
+                client_id = query_params.get('client', [None])[0]
        
-                    requests.put(
-                        LOG_URL, headers=headers, timeout=10, json={'client_id': client_id, 'graphs': list_of_ids, 'mode': 'original'})  # noqa
-
-                    self.send_response(201)
-                    self.send_header('Content-Type', 'text/plain')
-                    self.end_headers()
-
-                except DatabaseError as e:
-                    self.send_response(500)
-                    self.send_header('Content-Type', 'text/plain')
-                    self.end_headers()
-                    self.wfile.write(f'Database error: {e}'.encode('utf-8'))
-                    return
+                SESSION.put(
+                    LOG_URL, headers=headers, timeout=10, json={'client_id': client_id, 'graphs': list_of_ids, 'mode': 'original'})  # noqa
 
-            except requests.RequestException as e:
-                self.send_response(502)
-                self.send_header('Content-Type', 'text/plain')
-                self.end_headers()
-                self.wfile.write(f'Error fetching download: {
-                                 e}'.encode('utf-8'))
-                return
-        elif parsed_path.path == '/download_exec':
-            query_params = parse_qs(parsed_path.query)
-            if 'path' not in query_params:
-                self.send_response(400)
+                self.send_response(201)
                 self.send_header('Content-Type', 'text/plain')
                 self.end_headers()
-                self.wfile.write(b'Missing path parameter')
+
+            except DatabaseError as e:
+                self._send_error_text(500, f'Database error: {e}'.encode())
                 return
 
-            zip_path = query_params.get('path', [''])[0]
+        except requests.RequestException as e:
+            self._send_error_text(
+                502, f'Error fetching download: {e}'.encode())
+            return
+
+    def handle_download_exec(self, query):
+        """
+        Handle /download_exec: stream a finished zip and delete it.
+        """
+        query_params = parse_qs(query)
+        if 'path' not in query_params:
+            self._send_error_text(400, b'Missing path parameter')
+            return
 
-            existing_zip = os.path.exists(zip_path)
+        zip_path = query_params.get('path', [''])[0]
 
-            if not existing_zip:
-                self.send_response(404)
-                self.send_header('Content-Type', 'text/plain')
-                self.end_headers()
-                self.wfile.write(b'File not found')
-                return
+        existing_zip = os.path.exists(zip_path)
 
+        if not existing_zip:
+            self._send_error_text(404, b'File not found')
+            return
+
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/zip')
+            self.send_header(
+                'Content-Disposition', f'attachment; filename="{os.path.basename(zip_path)}"')  # noqa
+            self.end_headers()
+            with open(zip_path, 'rb') as file:
+                self.send_file_content(file)
+        except Exception as e:  # pylint: disable=broad-except
+            self._send_error_text(500, f'Error serving file: {e}'.encode())
+            return
+        finally:
+            # Delete even when streaming fails, so aborted downloads do
+            # not leak finished archives in ZIP_PATH.
             try:
+                os.remove(zip_path)
+            except OSError:
+                pass
+
+    def serve_static(self, route):
+        """
+        Serve a repository file (or fall back to directory listing).
+        """
+        file_path = unquote(route)
+        file_path = file_path[1:] if WINDOWS else file_path
+
+        if _is_drive_path(file_path):
+            file_path = file_path.lstrip('/')
+
+        if not os.path.isabs(file_path):
+            file_path = os.path.join(os.getcwd(), file_path.lstrip('/'))
+
+        # One stat answers existence and file-vs-directory in a single
+        # syscall; readability is enforced by open() below, so the old
+        # exists/access/isfile triple is redundant.
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
+            # Missing file, a path component that is not a directory,
+            # an unreadable parent: all were a 404 before the stat
+            # collapse, so keep answering instead of raising.
+            self._send_error_text(404, b'File not found or invalid path')
+            return
+
+        if not stat.S_ISREG(file_stat.st_mode):
+            super().do_GET()
+            return
+
+        try:
+            file = open(file_path, 'rb')
+        except PermissionError:
+            self._send_error_text(403, b'Forbidden: Cannot read file')
+            return
+        except OSError:
+            # Deleted or replaced between the stat and the open.
+            self._send_error_text(404, b'File not found or invalid path')
+            return
+
+        try:
+            with file:
                 self.send_response(200)
-                self.send_header('Content-Type', 'application/zip')
                 self.send_header(
-                    'Content-Disposition', f'attachment; filename="{os.path.basename(zip_path)}"')  # noqa
+                    'Content-Type', 'application/octet-stream')
+                self.send_header(
+                    'Content-Disposition', f'attachment; filename="{os.path.basename(file_path)}"')  # noqa
                 self.end_headers()
-                with open(zip_path, 'rb') as file:
-                    while True:
-                        chunk = file.read(8192)
-                        if not chunk:
-                            break
-                        self.wfile.write(chunk)
+                self.send_file_content(file)
+        except Exception as e:  # pylint: disable=broad-except
+            self._send_error_text(500, f'Error serving file: {e}'.encode())
+            return
 
-                os.remove(zip_path)
-            except Exception as e:  # pylint: disable=broad-except
-                self.send_response(500)
-                self.send_header('Content-Type', 'text/plain')
-                self.end_headers()
-                self.wfile.write(f'Error serving file: {e}'.encode('utf-8'))
-                return
-        else:
-            file_path = unquote(parsed_path.path)
-            file_path = file_path[1:] if WINDOWS else file_path
+    # Route table consulted once per request; unknown paths fall through
+    # to the static file handler.
+    ROUTES = {
+        '/download': handle_download,
+        '/download_exec': handle_download_exec,
+    }
 
-            if (file_path[1:3] == ':/' or file_path[1:3] == ':\\') and WINDOWS:
-                file_path = file_path.lstrip('/')
+    def _send_error_text(self, code, body):
+        """
+        Send a plain-text response with the given status code and body.
 
-            if not os.path.isabs(file_path):
-                file_path = os.path.join(os.getcwd(), file_path.lstrip('/'))
+        Args:
+            code (int): HTTP status code.
+            body (bytes): Response body.
+        """
+        self.send_response(code)
+        self.send_header('Content-Type', 'text/plain')
+        self.end_headers()
+        self.wfile.write(body)
 
-            if not os.path.exists(file_path):
-                self.send_response(404)
-                self.send_header('Content-Type', 'text/plain')
-                self.end_headers()
-                self.wfile.write(b'File not found or invalid path')
-                return
+    def send_file_content(self, file):
+        """
+        Send an open file's bytes to the client.
 
-            if not os.access(file_path, os.R_OK):
-                self.send_response(403)
-                self.send_header('Content-Type', 'text/plain')
-                self.end_headers()
-                self.wfile.write(b'Forbidden: Cannot read file')
-                return
+        Uses socket.sendfile, which performs a zero-copy os.sendfile on
+        plain sockets and falls back to a send loop on TLS connections,
+        instead of shuttling 8 KB chunks through user space.
 
-            self_path = file_path
-
-            is_file = os.path.isfile(self_path)
-
-            if is_file:
-                try:
-                    with open(self_path, 'rb') as file:
-                        self.send_response(200)
-                        self.send_header(
-                            'Content-Type', 'application/octet-stream')
-                        self.send_header(
-                            'Content-Disposition', f'attachment; filename="{os.path.basename(self_path)}"')  # noqa
-                        self.end_headers()
-                        while True:
-                            chunk = file.read(8192)
-                            if not chunk:
-                                break
-                            self.wfile.write(chunk)
-                except Exception as e:  # pylint: disable=broad-except
-                    self.send_response(500)
-                    self.send_header('Content-Type', 'text/plain')
-                    self.end_headers()
-                    self.wfile.write(f'Error serving file: {
-                                     e}'.encode('utf-8'))
-                    return
-            else:
-                super().do_GET()
+        Args:
+            file: Binary file object opened for reading.
+        """
+        self.wfile.flush()
+        self.connection.sendfile(file)
 
     def handle_zip_creation(self, list_of_files, query_params):
         """
@@ -260,25 +310,42 @@ class AuthHTTPRequestHandler(SimpleHTTPRequestHandler):
         # Notify the client via WebSocket
         LOGGER.info('Notifying client %s', user_id)
 
-        asyncio.run(notify_client(
-            user_id, {'status': 'ready', 'zip_path': zip_path}))
+        notify_client_threadsafe(
+            user_id, {'status': 'ready', 'zip_path': zip_path})
+
+    # CORS headers never change per request, so they are formatted and
+    # encoded once here instead of through four send_header format calls
+    # per response. Max-Age lets browsers cache the preflight verdict for
+    # a day instead of sending an OPTIONS round-trip per download.
+    _CORS_HEADERS = (
+        f'Access-Control-Allow-Origin: {WEB_URL}\r\n'
+        'Access-Control-Allow-Methods: GET, OPTIONS\r\n'
+        'Access-Control-Allow-Headers: Authorization, X-User-Token\r\n'
+        'Access-Control-Max-Age: 86400\r\n'
+    ).encode('latin-1', 'strict')
 
     def end_headers(self):
         """
         Add custom headers to the response.
         """
-        self.send_header('Access-Control-Allow-Origin', WEB_URL)
-        self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers',
-                         'Authorization, X-User-Token')
+        self._headers_buffer.append(self._CORS_HEADERS)
         super().end_headers()
 
+    # A preflight answer carries no request-dependent data, so the whole
+    # response is one precomputed blob written in a single call instead of
+    # a status line plus half a dozen formatted headers.
+    _OPTIONS_RESPONSE = (
+        'HTTP/1.1 204 No Content\r\n'
+        f'Access-Control-Allow-Origin: {WEB_URL}\r\n'
+        'Access-Control-Allow-Methods: GET, OPTIONS\r\n'
+        'Access-Control-Allow-Headers: Authorization, X-User-Token\r\n'
+        'Access-Control-Max-Age: 86400\r\n'
+        'Content-Length: 0\r\n'
+        '\r\n'
+    ).encode('latin-1', 'strict')
+
     def do_OPTIONS(self):  # pylint: disable=invalid-name
         """
         Handle OPTIONS requests for CORS preflight.
         """
-        self.send_response(200)
-        self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers',
-                         'Authorization, X-User-Token')
-        self.end_headers()
+        self.wfile.write(self._OPTIONS_RESPONSE)
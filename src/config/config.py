@@ -14,12 +14,15 @@ Constants:
     AUTH_TOKEN (str): Authorization token retrieved from environment variable
         AUTH.
     WEB_URL (str): Web URL retrieved from environment variable WEB_URL.
-    QUALITY (str): Quality setting retrieved from environment variable QUALITY,
-        default is "50".
+    QUALITY (int): Quality setting retrieved from environment variable QUALITY,
+        default is 50.
     IP_SERVER (str): Server IP address retrieved from environment variable
         IP_SERVER, default is "0.0.0.0".
-    PORT (str): Server port retrieved from environment variable PORT, default
-        is "8000".
+    PORT (int): Server port retrieved from environment variable PORT, default
+        is 8000.
+
+Numeric and boolean variables are parsed once here at import, so callers
+never re-convert them per request.
 """
 
 import os
@@ -31,22 +34,26 @@ load_dotenv()
 REPOSITORY = os.getenv("INTERNAL_PATH")
 DESTINATION = os.getenv("PREVIEW_PATH")
 DB_URL = os.getenv("DB_URL")
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
 AUTH_TOKEN = os.getenv("AUTH")
 WEB_URL = os.getenv("WEB_URL")
-QUALITY = os.getenv("QUALITY", "50")
+QUALITY = int(os.getenv("QUALITY", "50"))
 IP_SERVER = os.getenv("IP_SERVER", "0.0.0.0")
-PORT = os.getenv("PORT", "8000")
-PIXEL_LIMIT = os.getenv("PIXEL_LIMIT", "1200")
+PORT = int(os.getenv("PORT", "8000"))
+PIXEL_LIMIT = int(os.getenv("PIXEL_LIMIT", "1200"))
 ABSOLUTE_PATH = os.getenv("ABSOLUTE_PATH", "./")
 CERT_FILE = os.getenv("CERT_FILE", "./server.crt")
 KEY_FILE = os.getenv("KEY_FILE", "./server.key")
 DOWNLOAD_URL = os.getenv("DOWNLOAD_URL")
 LOG_URL = os.getenv("LOG_URL")
-RUN_HTTPS = os.getenv("RUN_HTTPS", "False")
+RUN_HTTPS = os.getenv("RUN_HTTPS", "False").lower() in ("1", "true", "yes")
 WINDOWS = os.name == "nt"
 SYSTEM = platform.system()
 MAGIC_PATH = os.getenv("MAGIC_PATH", "")
+CJPEGLI_PATH = os.getenv("CJPEGLI_PATH", "")
 RGB_PROFILE = os.getenv("RGB_PROFILE", "")
 ZIP_PATH = os.getenv("ZIP_PATH", "")
-CLEAN_ZIP_DAYS = os.getenv("CLEAN_ZIP_DAYS", "7")
-SOCKET_PORT = os.getenv("SOCKET_PORT", "8765")
+STATE_FILE = os.getenv("STATE_FILE", "./monitor_state.json")
+CLEAN_ZIP_DAYS = int(os.getenv("CLEAN_ZIP_DAYS", "7"))
+SOCKET_PORT = int(os.getenv("SOCKET_PORT", "8765"))
+HTTP_WORKERS = int(os.getenv("HTTP_WORKERS", "8"))
@@ -2,39 +2,71 @@
 Module for database connection management using psycopg2.
 
 This module provides functions to connect to and close connections with a
-PostgreSQL database using psycopg2.
+PostgreSQL database using psycopg2. Connections are served from a lazily
+created ThreadedConnectionPool so callers reuse sessions instead of paying
+a TCP/TLS handshake per query.
 
 Dependencies:
-    - psycopg2: PostgreSQL adapter for Python.
+    - psycopg2.pool: Thread-safe connection pooling for psycopg2.
     - config.DB_URL: Database URL imported from the `config` module.
+    - config.DB_POOL_MAX: Maximum number of pooled connections.
 
 Functions:
-    connect_db: Establishes a connection to the database and returns
-        connection and cursor objects.
-    close_db: Closes the connection and cursor passed as parameters.
+    connect_db: Fetches a connection from the pool and returns connection
+        and cursor objects.
+    close_db: Closes the cursor and returns the connection to the pool.
 """
 
-import psycopg2
-from src.config.config import DB_URL
+import threading
+
+from psycopg2 import pool
+from src.config.config import DB_URL, DB_POOL_MAX
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool():
+    """
+    Return the shared connection pool, creating it on first use.
+
+    The pool is created lazily so that worker processes forked later build
+    their own pool instead of sharing sockets with the parent.
+
+    Returns:
+        psycopg2.pool.ThreadedConnectionPool: The shared pool instance.
+    """
+    global _POOL  # pylint: disable=global-statement
+    if _POOL is None:
+        # Two threads can race the first use (monitor loop vs. an HTTP
+        # worker); without the lock each would build its own pool and
+        # putconn into the wrong one.
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = pool.ThreadedConnectionPool(1, DB_POOL_MAX, DB_URL)
+    return _POOL
 
 
 def connect_db():
     """
-    Establishes a connection to the database.
+    Fetches a connection to the database from the pool.
 
     Returns:
         tuple: A tuple containing the connection (`psycopg2
             .extensions.connection`)
             and cursor (`psycopg2.extensions.cursor`) objects.
     """
-    conn = psycopg2.connect(DB_URL)
+    conn = _get_pool().getconn()
     cur = conn.cursor()
     return conn, cur
 
 
 def close_db(conn, cur):
     """
-    Closes the database connection and cursor.
+    Closes the cursor and returns the connection to the pool.
+
+    Connections that were closed by the server are discarded instead of
+    being put back.
 
     Args:
         conn (psycopg2.extensions.connection): PostgreSQL database connection
@@ -44,5 +76,6 @@ def close_db(conn, cur):
     Returns:
         None
     """
-    cur.close()
-    conn.close()
+    if not cur.closed:
+        cur.close()
+    _get_pool().putconn(conn, close=conn.closed)
@@ -15,183 +15,253 @@ Dependencies:
 
 Functions:
     log_error_to_db: Logs an error message to the database.
-    save_to_database: Saves information (original and preview filenames, graph ID,
-        DPI, dimensions, pixels, size) to the database.
+    save_children_batch: Saves a burst of graphs_children rows and error
+        logs in one transaction.
 """
 
 
+import csv
+import io
+import threading
 import uuid
+from collections import OrderedDict
 
 import psycopg2
 from psycopg2 import DatabaseError, Error, sql
+from psycopg2.extras import execute_values, register_uuid
 
 import src.logs.logger as log
+from src.config.config import DB_URL
 from src.database.db_connection import close_db, connect_db
 
+# UUID values are sent/read as native uuid.UUID instead of text casts.
+register_uuid()
+
+# Queries are composed once at import time instead of on every call.
+LOG_INSERT_QUERY = sql.SQL(
+    "INSERT INTO logs_script (id, log) VALUES (%s, %s)")
+CHILD_BATCH_INSERT_QUERY = (
+    "INSERT INTO graphs_children (id, graph_id, preview, original, size, name) "  # noqa
+    "VALUES %s"
+)
+LOG_BATCH_INSERT_QUERY = "INSERT INTO logs_script (id, log) VALUES %s"
+CHILD_COPY_QUERY = (
+    "COPY graphs_children (id, graph_id, preview, original, size, name) "
+    "FROM STDIN WITH (FORMAT csv)"
+)
+# Bursts at least this large go through COPY instead of execute_values.
+COPY_THRESHOLD = 500
+DIRECTORY_UPSERT_QUERY = sql.SQL(
+    "INSERT INTO graphs (id, name, path) VALUES (%s, %s, %s) "
+    "ON CONFLICT (path) DO UPDATE SET name = EXCLUDED.name "
+    "RETURNING id"
+)
+CHILD_EXISTS_QUERY = "SELECT 1 FROM graphs_children WHERE original = %s"
+CHILD_EXISTS_ANY_QUERY = (
+    "SELECT original FROM graphs_children WHERE original = ANY(%s)"
+)
+ZIP_ITEM_INSERT_QUERY = sql.SQL(
+    'INSERT INTO zip_items (id, user_id, path, "end") VALUES (%s, %s, %s, %s)')  # noqa
+ZIP_ITEM_DELETE_QUERY = sql.SQL(
+    "DELETE FROM zip_items WHERE user_id = %s")
+
+
+# The error-log path keeps one long-lived connection of its own so that
+# logging never negotiates TLS again and never competes for the pool.
+_log_conn = None
+_log_conn_lock = threading.Lock()
+
 
 def log_error_to_db(error_text):
     """
     Log an error message to the database.
 
+    Uses a dedicated persistent connection, reopened transparently if the
+    server dropped it.
+
     Args:
         error_text (str): Error message to log.
 
     Returns:
         None
     """
-    conn, cur = connect_db()
-    try:
-        log_id = uuid.uuid4()
-        query = sql.SQL("INSERT INTO logs_script (id, log) VALUES (%s, %s)")
-        cur.execute(query, (str(log_id), error_text))
-        conn.commit()
-    except DatabaseError as exc:
-        log.LOGGER.error("Error logging to the database: %s", exc)
-        conn.rollback()
-    finally:
-        close_db(conn, cur)
-
-
-def save_to_database(original_filename,
-                     preview_filename,
-                     graph_id,
-                     dpi,  # pylint: disable=unused-argument
-                     dimension,  # pylint: disable=unused-argument
-                     pixels,  # pylint: disable=unused-argument
-                     size,
-                     name,
-                     error=None):
+    global _log_conn  # pylint: disable=global-statement
+    with _log_conn_lock:
+        try:
+            if _log_conn is None or _log_conn.closed:
+                _log_conn = psycopg2.connect(DB_URL)
+            with _log_conn.cursor() as cur:
+                cur.execute(LOG_INSERT_QUERY, (uuid.uuid4(), error_text))
+            _log_conn.commit()
+        except DatabaseError as exc:
+            log.LOGGER.error("Error logging to the database: %s", exc)
+            # The connect itself may have failed, leaving no connection
+            # to roll back.
+            if _log_conn is not None:
+                try:
+                    _log_conn.rollback()
+                except Error:
+                    _log_conn = None
+
+
+def save_children_batch(rows, error_messages=None):
     """
-    Save information to the database.
+    Save a burst of graphs_children rows and error logs in one transaction.
 
     Args:
-        original_filename (str): Original filename or path.
-        preview_filename (str): Preview filename or path.
-        graph_id (uuid.UUID): ID of the associated graph or entity.
-        dpi (int or None): DPI (dots per inch) of the image.
-        dimension (str or None): Dimensions of the image.
-        pixels (int or None): Number of pixels in the image.
-        size (float or None): Size of the image file in MB.
-        name (str or None): Name of the image.
-        error (str or None, optional): Error message (if any). Defaults to None. # noqa
+        rows (list): List of tuples
+            (original_filename, preview_filename, graph_id, size, name).
+        error_messages (list or None, optional): Error texts from the same
+            burst, written to logs_script in the same transaction.
 
     Returns:
         None
     """
+    if not rows and not error_messages:
+        return
     conn = None
     try:
         conn, cur = connect_db()
-        entry_id = uuid.uuid4()
-        if error:
-            query = sql.SQL(
-                "INSERT INTO logs_script (id, log) VALUES (%s, %s)")
-            cur.execute(query, (str(entry_id), str(error)))
-        else:
-            query = sql.SQL(
-                "INSERT INTO graphs_children (id, graph_id, preview, original, size, name) "  # noqa
-                "VALUES (%s, %s, %s, %s, %s, %s)"
-            )
-            cur.execute(query, (
-                str(entry_id),
-                str(graph_id),
-                preview_filename,
-                original_filename,
-                size,
-                name
-            ))
+        if rows:
+            values = [
+                (uuid.uuid4(), graph_id, preview_filename,
+                 original_filename, size, name)
+                for original_filename, preview_filename, graph_id, size, name
+                in rows
+            ]
+            if len(values) >= COPY_THRESHOLD:
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(values)
+                buffer.seek(0)
+                cur.copy_expert(CHILD_COPY_QUERY, buffer)
+            else:
+                execute_values(cur, CHILD_BATCH_INSERT_QUERY, values)
+        if error_messages:
+            execute_values(cur, LOG_BATCH_INSERT_QUERY,
+                           [(uuid.uuid4(), text)
+                            for text in error_messages])
         conn.commit()
-        log.LOGGER.info("Information saved to the database successfully!")
+        log.LOGGER.info("Saved %d rows and %d logs to the database in one batch.",  # noqa
+                        len(rows), len(error_messages or []))
     except Error as e:
         log.LOGGER.error(
             "Error connecting or interacting with the database: %s", e)
     except Exception as e:  # pylint: disable=broad-except
-        log.LOGGER.error("Error saving information to the database: %s", e)
+        log.LOGGER.error("Error saving batch to the database: %s", e)
     finally:
         if conn:
             close_db(conn, cur)
 
 
-def get_directory_id(dir_relative_path):
+def register_directory(dir_name, dir_relative_path):
     """
-    Retrieve the ID of a directory from the database.
+    Register a directory and return its ID in a single round-trip.
+
+    Uses an UPSERT so the lookup and the insert that used to be two
+    queries collapse into one: a new path is inserted with a fresh UUID,
+    an existing one returns its stored ID.
 
     Args:
+        dir_name (str): Name of the directory.
         dir_relative_path (str): Relative path of the directory.
 
     Returns:
-        uuid.UUID or None: UUID of the directory if found, None otherwise.
+        uuid.UUID or None: ID of the directory, or None on database error.
     """
     conn, cur = connect_db()
     try:
-        query = sql.SQL("SELECT id FROM graphs WHERE path = %s")
-        cur.execute(query, (dir_relative_path,))
+        dir_id = uuid.uuid4()
+        cur.execute(DIRECTORY_UPSERT_QUERY,
+                    (dir_id, dir_name, dir_relative_path))
         result = cur.fetchone()
+        conn.commit()
         if result:
+            if result[0] == dir_id:
+                log.LOGGER.info("New dir registered in the db: %s with relative path %s, UUID: %s",  # noqa
+                                dir_name, dir_relative_path, dir_id)
             return result[0]
-        else:
-            return None
+        return None
     except DatabaseError as exc:
-        inner_error_message = f"Error retrieving directory ID from the database: {exc}"  # noqa
+        inner_error_message = f"Error registering directory in the database: {
+            exc}"
         log.LOGGER.error(inner_error_message)
         log_error_to_db(inner_error_message)
+        conn.rollback()
+        return None
     finally:
         close_db(conn, cur)
 
 
-def insert_new_directory(dir_id, dir_name, dir_relative_path):
+def load_registered_originals(file_paths):
     """
-    Insert a new directory into the database.
+    Fetch which of the given originals are already registered, in one query.
+
+    Replaces one SELECT per file during a burst with a single ANY() lookup
+    whose result the caller tests by set membership.
 
     Args:
-        dir_id (uuid.UUID): Unique identifier for the directory.
-        dir_name (str): Name of the directory.
-        dir_relative_path (str): Relative path of the directory.
+        file_paths (list): Candidate original paths.
 
     Returns:
-        None
+        set: The subset of file_paths present in graphs_children.
     """
-    conn, cur = connect_db()
+    if not file_paths:
+        return set()
+    conn = None
     try:
-        query = sql.SQL(
-            "INSERT INTO graphs (id, name, path) VALUES (%s, %s, %s)")
-        cur.execute(query, (str(dir_id), dir_name, dir_relative_path))
-        conn.commit()
-        log.LOGGER.info("New dir registered in the db: %s with relative path %s, UUID: %s",  # noqa
-                        dir_name, dir_relative_path, dir_id)
-    except DatabaseError as exc:
-        inner_error_message = f"Error registering directory in the database: {
-            exc}"
-        log.LOGGER.error(inner_error_message)
-        log_error_to_db(inner_error_message)
-        conn.rollback()
+        conn, cur = connect_db()
+        cur.execute(CHILD_EXISTS_ANY_QUERY, (list(file_paths),))
+        return {row[0] for row in cur.fetchall()}
+    except (Exception, psycopg2.DatabaseError) as error:  # pylint: disable=broad-except # noqa
+        log.LOGGER.error("Database error: %s", error)
+        return set()
     finally:
-        close_db(conn, cur)
+        if conn is not None:
+            close_db(conn, cur)
+
+
+# Positive-only LRU for is_file_registered: a path that was registered
+# stays registered, while a miss must keep asking the database because
+# the row may be inserted later (or by another process).
+_registered_files = OrderedDict()
+_REGISTERED_CACHE_MAX = 100_000
 
 
 def is_file_registered(file_path):
     """
     Check if a file is already registered in the database.
 
+    Positive answers are memoized, so retries and repeated events for the
+    same path skip the SELECT round-trip.
+
     Args:
         file_path (str): Path to the file.
 
     Returns:
         bool: True if the file is registered, False otherwise.
     """
+    if file_path in _registered_files:
+        _registered_files.move_to_end(file_path)
+        return True
+
     conn = None
     try:
         conn, cur = connect_db()
-        query = "SELECT 1 FROM graphs_children WHERE original = %s"
-        cur.execute(query, (file_path,))
+        cur.execute(CHILD_EXISTS_QUERY, (file_path,))
         result = cur.fetchone()
-        cur.close()
-        return result is not None
     except (Exception, psycopg2.DatabaseError) as error:  # pylint: disable=broad-except # noqa
         log.LOGGER.error("Database error: %s", error)
         return False
     finally:
         if conn is not None:
-            conn.close()
+            close_db(conn, cur)
+
+    if result is None:
+        return False
+    _registered_files[file_path] = True
+    if len(_registered_files) > _REGISTERED_CACHE_MAX:
+        _registered_files.popitem(last=False)
+    return True
 
 
 def fetch_filtered_items(query_values, states):
@@ -244,9 +314,7 @@ def save_download_pending(client_id, path, end):
     try:
         d_id = uuid.uuid4()
 
-        query = sql.SQL(
-            'INSERT INTO zip_items (id, user_id, path, "end") VALUES (%s, %s, %s, %s)')  # noqa
-        cur.execute(query, (str(d_id), client_id, path, end))
+        cur.execute(ZIP_ITEM_INSERT_QUERY, (d_id, client_id, path, end))
         conn.commit()
     except DatabaseError as exc:
         inner_error_message = f"Error registering socket path in the database: {  # noqa
@@ -270,9 +338,7 @@ def delete_all_download_pending(client_id):
     """
     conn, cur = connect_db()
     try:
-        query = sql.SQL(
-            "DELETE FROM zip_items WHERE user_id = %s")
-        cur.execute(query, (client_id,))
+        cur.execute(ZIP_ITEM_DELETE_QUERY, (client_id,))
         conn.commit()
     except DatabaseError as exc:
         inner_error_message = f"Error deleting socket path in the database: {  # noqa
@@ -8,7 +8,7 @@ operations using the configured LOGGER.
 Dependencies:
     - os: Provides access to operating system functionalities.
     - PIL.Image, PIL.ImageFile: Image processing library and utilities.
-    - operations.save_to_database: Function to save data to a database.
+    - operations.is_file_registered: Function to check for an existing row.
     - db_logger.LOGGER: Logger object for logging operations.
     - config.QUALITY: Quality setting for image compression.
 
@@ -21,24 +21,27 @@ Functions:
 import os
 import warnings
 from PIL import Image, ImageFile
-from src.image.manual import manual_conversion
+from src.image.manual import manual_conversion, jpeg_conversion
 from src.image.magick import magick_conversion
 
 from src.config.config import QUALITY, PIXEL_LIMIT
 from src.logs.logger import LOGGER
-from src.database.db_operations import save_to_database, is_file_registered
+from src.database.db_operations import is_file_registered
 
 ImageFile.LOAD_TRUNCATED_IMAGES = True
-Image.MAX_IMAGE_PIXELS = 250000000000
+# The repository only holds trusted production artwork, so skip Pillow's
+# decompression-bomb pixel count check instead of raising the ceiling.
+Image.MAX_IMAGE_PIXELS = None
 
 # Ignore warnings
 warnings.filterwarnings("ignore", category=Image.DecompressionBombWarning)
 
 def preview(arch,
-            folder_path,
+            folder_path,  # pylint: disable=unused-argument
             folder_destiny='previews',
             graph_id='none',
-            quality=int(QUALITY)):
+            quality=QUALITY,
+            registered=None):
     """
     Generate a preview of an image.
 
@@ -54,47 +57,72 @@ def preview(arch,
         graph_id (str, optional): ID associated with the image.
         Defaults to 'none'. quality (int, optional): Quality level for JPEG
         compression. Defaults to the value defined in config.QUALITY.
+        registered (bool, optional): Whether the original is already in the
+            database, when the caller preloaded that in bulk. None falls
+            back to a per-file lookup.
 
     Returns:
-        None
+        tuple or None: Metadata row (original, preview, graph_id, size, name)
+        to insert into graphs_children, or None if the file was skipped.
+
+    Raises:
+        Exception: Re-raised conversion errors; the caller collects them
+        into the burst's error batch.
     """
-    LOGGER.info("Processing %s...", arch)
+    LOGGER.debug("Processing %s...", arch)
 
-    if not os.path.exists(folder_destiny):
-        os.makedirs(folder_destiny)
+    os.makedirs(folder_destiny, exist_ok=True)
 
-    module = arch.replace(folder_path, '').replace('\\', '/').split('.')
-    path = module[0].split('/')
-    name = path[-1]
-    LOGGER.info("Converting %s... with %s of quality", name, quality)
+    name, ext = os.path.splitext(os.path.basename(arch))
+    LOGGER.debug("Converting %s... with %s of quality", name, quality)
 
-    output_path = f'{folder_destiny}/{name}.jpeg'
+    output_path = os.path.join(folder_destiny, f'{name}.jpeg')
 
     try:
-        ext = arch.split('.')[-1].lower()
+        ext = ext.lstrip('.').lower()
         if ext == 'psb':
             manual_conversion(arch, output_path)
+        elif ext in ('jpg', 'jpeg') and jpeg_conversion(arch, output_path):
+            pass
         else:
             magick_conversion(arch, output_path, quality, PIXEL_LIMIT)
 
         dpi = None
         dimension = None
         pixels = None
+        try:
+            # Image.open only parses the header, so dimensions and DPI come
+            # out without decoding a single pixel.
+            with Image.open(arch) as img:
+                dimension = f"{img.width}x{img.height}"
+                pixels = img.width * img.height
+                dpi_info = img.info.get('dpi')
+                if dpi_info:
+                    dpi = round(dpi_info[0])
+        except Exception:  # pylint: disable=broad-except
+            # Formats Pillow cannot identify (e.g. PSB) keep the defaults.
+            pass
+
+        if dimension:
+            LOGGER.debug("Original %s: %s pixels, dpi %s", arch, dimension, dpi)
 
         # Get size of the original file
-        size_original = os.path.getsize(arch) / (1024 * 1024) if os.path.exists(arch) else None  # noqa
+        try:
+            size_original = os.stat(arch).st_size / (1024 * 1024)
+        except OSError:
+            size_original = None
         size_original_mb = f"{size_original:.2f}" if size_original else None
 
-        LOGGER.info("Conversion of %s completed successfully!", arch)
+        LOGGER.debug("Conversion of %s completed successfully!", arch)
 
-        if is_file_registered(arch):
-            LOGGER.info("File %s is already registered. Skipping re-save.", arch)  # noqa
-            return
+        if registered is None:
+            registered = is_file_registered(arch)
+        if registered:
+            LOGGER.debug("File %s is already registered. Skipping re-save.", arch)  # noqa
+            return None
 
-        save_to_database(arch, output_path, graph_id, dpi,
-                         dimension, pixels, size_original_mb, name)
+        return (arch, output_path, graph_id, size_original_mb, name)
 
-    except Exception as e:  # pylint: disable=broad-except
+    except Exception as e:
         LOGGER.error("An error occurred while converting the file: %s", e)
-        save_to_database(arch, None, graph_id, None,
-                         None, None, None, None, str(e))
+        raise
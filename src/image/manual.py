@@ -2,34 +2,109 @@
 This module contains the manual function that converts a PSB file to a JPEG file.
 """
 
+import os
+import subprocess
+import tempfile
 import warnings
+import numpy as np
 import psd_tools
 from PIL import Image, ImageFile
-from src.config.config import QUALITY, PIXEL_LIMIT
+from src.config.config import QUALITY, PIXEL_LIMIT, CJPEGLI_PATH
 ImageFile.LOAD_TRUNCATED_IMAGES = True
 
 # Ignore warnings
 warnings.filterwarnings("ignore", category=Image.DecompressionBombWarning)
 warnings.filterwarnings("ignore", category=UserWarning, module='psd_tools')
 
-def manual_conversion(arch, output_path): 
+def save_jpeg(img, output_path):
+    """
+    Encode an image as JPEG, using the jpegli encoder when available.
+
+    If CJPEGLI_PATH points to a cjpegli binary, the image is piped through it
+    for a better size/quality ratio at the same quality setting. Otherwise the
+    image is saved with Pillow's own encoder.
+    """
+    if CJPEGLI_PATH:
+        tmp_fd, tmp_path = tempfile.mkstemp(suffix='.png')
+        os.close(tmp_fd)
+        try:
+            img.save(tmp_path, 'PNG')
+            subprocess.run([CJPEGLI_PATH, tmp_path, output_path,
+                            '-q', str(QUALITY)],
+                           check=True, text=True, capture_output=True)
+            return
+        except (subprocess.CalledProcessError, OSError) as e:
+            print(f"Error in cjpegli encode, falling back to Pillow: {e}")
+        finally:
+            os.remove(tmp_path)
+
+    # Fixed web_high tables with 4:2:0 subsampling encode in one pass;
+    # optimize=True ran a whole extra encode pass to derive similar tables.
+    img.save(output_path, 'JPEG', qtables='web_high', subsampling=2,
+             progressive=True)
+
+def composite_to_pil(psb):
+    """
+    Build a PIL image from the PSD composite.
+
+    The numpy route converts the composite buffer in one vectorized pass
+    instead of the per-channel copies topil() makes, which matters on
+    multi-gigapixel PSB composites. Falls back to topil() for modes the
+    array path does not cover.
+    """
+    try:
+        arr = psb.numpy()
+        if arr.ndim == 3 and arr.shape[2] in (3, 4):
+            if arr.dtype != np.uint8:
+                arr = (arr * 255.0 + 0.5).astype(np.uint8)
+            return Image.fromarray(
+                arr, 'RGB' if arr.shape[2] == 3 else 'RGBA')
+    except Exception as e:  # pylint: disable=broad-except
+        print(f"Numpy composite failed, falling back to topil: {e}")
+    return psb.topil()
+
+def jpeg_conversion(arch, output_path):
+    """
+    Convert a JPEG file to a JPEG preview without spawning ImageMagick.
+
+    draft() lets libjpeg decode directly at 1/2, 1/4 or 1/8 scale in the
+    DCT domain, so a huge original is never fully decompressed; thumbnail()
+    then finishes the downscale. CMYK originals are left to the ImageMagick
+    path, which applies the RGB profile conversion.
+
+    Returns:
+        bool: True if the preview was written, False if the caller should
+        fall back to ImageMagick.
+    """
+    with Image.open(arch) as img:
+        if img.mode == 'CMYK':
+            return False
+
+        max_dimension = PIXEL_LIMIT
+        img.draft('RGB', (max_dimension, max_dimension))
+        img.thumbnail((max_dimension, max_dimension),
+                      Image.LANCZOS)  # pylint: disable=no-member
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        save_jpeg(img, output_path)
+    return True
+
+def manual_conversion(arch, output_path):
     """
     Convert a PSB file to a JPEG file
     """
     psb = psd_tools.PSDImage.open(arch)
-    img = psb.topil()
+    img = composite_to_pil(psb)
 
     if img.mode in ('CMYK', 'RGBA', 'LA', 'P'):
         print('Converting to RGB')
         img = img.convert('RGB')
 
-    max_dimension = int(PIXEL_LIMIT)
+    max_dimension = PIXEL_LIMIT
     if img.width > max_dimension or img.height > max_dimension:
-        ratio = min(max_dimension / img.width,
-                    max_dimension / img.height)
-        new_size = (int(img.width * ratio), int(img.height * ratio))
-        img = img.resize(
-            new_size, Image.LANCZOS)  # pylint: disable=no-member
-
-    img.save(output_path, 'JPEG', quality=int(QUALITY),
-            optimize=True, progressive=True)
\ No newline at end of file
+        # thumbnail() resizes in place and uses a cheap integer reduction
+        # before the final LANCZOS pass, instead of one full-size resample.
+        img.thumbnail((max_dimension, max_dimension),
+                      Image.LANCZOS)  # pylint: disable=no-member
+
+    save_jpeg(img, output_path)
@@ -5,6 +5,10 @@ This module initializes a logger and provides functions to log script
 initialization and shutdown messages using the logger. It also logs these
 messages to a database via operations.log_error_to_db().
 
+Log records are handed to a QueueHandler and formatted/written by a
+QueueListener on a dedicated thread, so callers on the processing hot path
+never block on terminal I/O.
+
 Dependencies:
     - logging: Standard Python logging library.
     - operations: Module providing database logging functionality.
@@ -13,13 +17,47 @@ Constants:
     LOGGER: Logger object configured for this module.
 """
 
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
 import src.database.db_operations as db_operations
 
-logging.basicConfig(level=logging.INFO)
+_log_queue = queue.Queue(-1)
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(
+    logging.Formatter("%(levelname)s:%(name)s:%(message)s"))
+
+_root = logging.getLogger()
+_root.setLevel(logging.INFO)
+_root.addHandler(QueueHandler(_log_queue))
+
+_listener = QueueListener(_log_queue, _stream_handler,
+                          respect_handler_level=True)
+_listener.start()
+atexit.register(_listener.stop)
+
 LOGGER = logging.getLogger(__name__)
 
 
+def init_worker_logging():
+    """
+    Reconfigure logging inside a forked worker process.
+
+    Workers inherit the parent's QueueHandler but not the listener thread
+    that drains its queue, so their records would pile up unread. Replace
+    the queue with direct stream output; workers are off the parent's hot
+    path, so blocking writes are fine there.
+
+    Returns:
+        None
+    """
+    for handler in list(_root.handlers):
+        _root.removeHandler(handler)
+    _root.addHandler(_stream_handler)
+
+
 def log_initialization():
     """
     Logs script initialization.
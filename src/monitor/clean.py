@@ -16,7 +16,7 @@ def delete_old_files():
     """"
     Delete old zip files from the ZIP_PATH directory.
     """
-    cutoff_time = datetime.now() - timedelta(days=int(CLEAN_ZIP_DAYS))
+    cutoff_time = datetime.now() - timedelta(days=CLEAN_ZIP_DAYS)
     cutoff_timestamp = cutoff_time.timestamp()
     for filename in os.listdir(ZIP_PATH):
         file_path = os.path.join(ZIP_PATH, filename)
@@ -3,7 +3,8 @@ Module for monitoring a folder and its subfolders, registering directories in a
 database, and processing modified files.
 
 This module includes functions for:
-- Monitoring a specified folder and its subfolders.
+- Monitoring a specified folder and its subfolders using native filesystem
+  events (inotify/FSEvents/ReadDirectoryChangesW via watchdog).
 - Registering new directories in a database if they are not already registered.
 - Processing modified files by generating previews, logging operations, and
   saving metadata to a database.
@@ -11,25 +12,31 @@ This module includes functions for:
 Dependencies:
     - os: Provides access to operating system functionalities.
     - signal: Allows handling of signals such as SIGINT and SIGTERM.
-    - psycopg2: PostgreSQL adapter for Python.
-    - uuid: Generates UUIDs for directory IDs.
+    - queue: Thread-safe queue used to hand events from watchdog to the
+      processing loop.
+    - watchdog: Native filesystem event observer (inotify/FSEvents).
     - db_logger.LOGGER: Logger object for logging operations.
     - image.preview: Function to generate image previews.
     - operations.log_error_to_db: Function to log errors to a database.
     - config.DESTINATION: Destination folder for processed files.
     - config.REPOSITORY: Root folder being monitored.
-    - db_connection.connect_db, db_connection.close_db: Functions for
-      establishing and closing database connections.
 """
 
+import json
 import os
+import queue
 import signal
 import time
 import uuid
 import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 
-from src.config.config import DESTINATION, REPOSITORY
-from src.logs.logger import LOGGER, log_shutdown
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from src.config.config import DESTINATION, REPOSITORY, STATE_FILE
+from src.logs.logger import LOGGER, init_worker_logging, log_shutdown  # noqa
 from src.image.image import preview
 import src.database.db_operations as db
 
@@ -59,48 +66,207 @@ def is_directory_empty(directory):
                          directory}'.") from exc
 
 
+# Suffixes used by editors and transfer tools for in-progress files.
+IGNORED_SUFFIXES = ('.tmp', '.part', '.crdownload', '.swp', '~')
+
+
+def is_ignored(path):
+    """
+    Check whether a path is hidden or a temporary/in-progress file.
+
+    Args:
+        path (str): Path to check.
+
+    Returns:
+        bool: True if the path should never enter the processing pipeline.
+    """
+    name = os.path.basename(path)
+    return name.startswith('.') or name.endswith(IGNORED_SUFFIXES)
+
+
+# LRU cache of directory relative path -> database id, so repeated files in
+# the same directory do not trigger a SELECT per file. Bounded so a huge
+# repository cannot grow it without limit.
+_directory_ids = OrderedDict()
+_DIRECTORY_CACHE_MAX = 4096
+
+
 def ensure_directory_registered(full_dir_path):
     """
     Ensure that a directory is registered in the database.
 
     If the directory is not already registered, it inserts it into the database
-    with a generated UUID.
+    with a generated UUID. Resolved IDs are kept in a bounded LRU cache so
+    only the first file in a directory pays the database round-trip.
 
     Args:
         full_dir_path (str): Full path of the directory.
 
     Returns:
-        uuid.UUID: UUID of the directory.
+        uuid.UUID or None: UUID of the directory, or None on database
+        failure so the caller neither caches nor trusts a made-up ID.
     """
     dir_relative_path = os.path.relpath(full_dir_path, REPOSITORY)
-    dir_id = db.get_directory_id(dir_relative_path)
+    dir_id = _directory_ids.get(dir_relative_path)
+    if dir_id is not None:
+        _directory_ids.move_to_end(dir_relative_path)
+        return dir_id
+
+    dir_id = db.register_directory(os.path.basename(full_dir_path),
+                                   dir_relative_path)
     if dir_id is None:
-        dir_name = os.path.basename(full_dir_path)
-        dir_id = uuid.uuid4()
-        db.insert_new_directory(dir_id, dir_name, dir_relative_path)
+        return None
+    _directory_ids[dir_relative_path] = dir_id
+    if len(_directory_ids) > _DIRECTORY_CACHE_MAX:
+        _directory_ids.popitem(last=False)
     return dir_id
 
 
+def scan_tree(folder_path, files_dict, seen_directories):
+    """
+    Record file mtimes under folder_path using os.scandir.
+
+    Unlike os.walk + os.path.getmtime, this reuses the stat result cached
+    on each DirEntry, so the initial scan costs one readdir per directory
+    instead of an extra stat syscall per file.
+
+    Args:
+        folder_path (str): Directory to scan recursively.
+        files_dict (dict): Mapping of file path -> (mtime, size) to fill in.
+        seen_directories (set): Set of already-visited directory paths.
+
+    Returns:
+        None
+    """
+    seen_directories.add(folder_path)
+    try:
+        entries = os.scandir(folder_path)
+    except (FileNotFoundError, PermissionError):
+        return
+    with entries:
+        for entry in entries:
+            if is_ignored(entry.name):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    scan_tree(entry.path, files_dict, seen_directories)
+                else:
+                    stat = entry.stat()
+                    files_dict[entry.path] = (stat.st_mtime, stat.st_size)
+            except FileNotFoundError:
+                files_dict[entry.path] = None
+
+
+def load_fingerprints():
+    """
+    Load the persisted file fingerprints from STATE_FILE.
+
+    Returns:
+        dict or None: Mapping of file path -> (mtime, size), or None when no
+        usable state file exists (first run or corrupted file).
+    """
+    try:
+        with open(STATE_FILE, encoding='utf-8') as state:
+            return {path: tuple(fingerprint) if fingerprint else None
+                    for path, fingerprint in json.load(state).items()}
+    except (OSError, ValueError):
+        return None
+
+
+def save_fingerprints(files_dict):
+    """
+    Persist the file fingerprints to STATE_FILE atomically.
+
+    Args:
+        files_dict (dict): Mapping of file path -> (mtime, size).
+
+    Returns:
+        None
+    """
+    tmp_path = STATE_FILE + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as state:
+            json.dump(files_dict, state)
+        os.replace(tmp_path, STATE_FILE)
+    except OSError as exc:
+        LOGGER.error("Could not persist monitor state: %s", exc)
+
+
+class RepositoryEventHandler(FileSystemEventHandler):
+    """
+    Watchdog handler that forwards filesystem events to the processing loop.
+
+    File and directory events are pushed onto a thread-safe queue so that the
+    monitor loop can drain them in batches instead of walking the whole tree.
+    """
+
+    def __init__(self, events):
+        super().__init__()
+        self.events = events
+
+    def on_created(self, event):
+        if not is_ignored(event.src_path):
+            self.events.put(('dir' if event.is_directory else 'file',
+                             event.src_path))
+
+    def on_modified(self, event):
+        if not event.is_directory and not is_ignored(event.src_path):
+            self.events.put(('file', event.src_path))
+
+    def on_moved(self, event):
+        if not is_ignored(event.dest_path):
+            self.events.put(('dir' if event.is_directory else 'file',
+                             event.dest_path))
+
+    def on_closed(self, event):
+        # inotify CLOSE_WRITE: the writer finished, so the file is whole.
+        # On platforms without it the modified/created events still apply.
+        if not event.is_directory and not is_ignored(event.src_path):
+            self.events.put(('file', event.src_path))
+
+
 def monitor_folder(folder_path, force_resync=False):
     """Monitor the specified folder and its subfolders."""
     LOGGER.info("Monitoring folder '%s' and its subfolders...", folder_path)
     files_dict = {}
     seen_directories = set()
+    created_destinations = set()
+    # Parent directory -> destination path; directory IDs stay in the
+    # bounded LRU behind ensure_directory_registered so nothing pins them.
+    directory_info = {}
 
+    events = queue.Queue()
+
+    scan_tree(folder_path, files_dict, seen_directories)
     # WARN - If this true, all existent files will be reprocessed
-    if not force_resync:
-        for root, dirs, files in os.walk(folder_path):
-            seen_directories.add(root)
-            for file in files:
-                if not file.startswith('.'):
-                    file_path = os.path.join(root, file)
-                    try:
-                        files_dict[file_path] = os.path.getmtime(file_path)
-                    except FileNotFoundError:
-                        files_dict[file_path] = None
+    if force_resync:
+        for file_path in files_dict:
+            events.put(('file', file_path))
+            files_dict[file_path] = None
+    else:
+        # Files whose (mtime, size) fingerprint no longer matches the
+        # persisted state changed while the monitor was down; queue just
+        # those instead of re-previewing the whole tree.
+        saved_fingerprints = load_fingerprints()
+        if saved_fingerprints is not None:
+            for file_path, fingerprint in files_dict.items():
+                if saved_fingerprints.get(file_path) != fingerprint:
+                    events.put(('file', file_path))
+                    files_dict[file_path] = None
+        save_fingerprints(files_dict)
+
+    observer = Observer()
+    observer.schedule(RepositoryEventHandler(events), folder_path,
+                      recursive=True)
+    observer.start()
+
+    # Preview generation is CPU-bound (decode + resize + encode), so a burst
+    # of files is spread across worker processes instead of encoded serially.
+    executor = ProcessPoolExecutor(initializer=init_worker_logging)
 
     def signal_handler(sign, frame):  # pylint: disable=unused-argument
         """Handler for termination signal."""
+        observer.stop()
         log_shutdown()
         sys.exit(0)
 
@@ -110,51 +276,86 @@ def monitor_folder(folder_path, force_resync=False):
     while True:
         time.sleep(1)
         updated_files = {}
-        current_directories = set()
-
-        for root, dirs, files in os.walk(folder_path):
-            current_directories.add(root)
-            for dir_name in dirs:
-                full_dir_path = os.path.join(root, dir_name)
-                if full_dir_path not in seen_directories:
-                    if not is_directory_empty(full_dir_path):
-                        dir_id = ensure_directory_registered(full_dir_path)
-                    else:
-                        LOGGER.info("Empty directory ignored: %s",
-                                    full_dir_path)
-                    seen_directories.add(full_dir_path)
 
-            for file in files:
-                if not file.startswith('.'):
-                    file_path = os.path.join(root, file)
-                    try:
-                        mt = os.path.getmtime(file_path)
-                    except FileNotFoundError:
-                        mt = None
-                    if file_path not in files_dict or files_dict[file_path] != mt:  # noqa
-                        updated_files[file_path] = mt
+        while True:
+            try:
+                kind, event_path = events.get_nowait()
+            except queue.Empty:
+                break
 
-        if updated_files:
-            LOGGER.info("Modified files:")
-            for file_path, mt in updated_files.items():
-                LOGGER.info("%s: %s", file_path, mt)
+            if kind == 'dir':
+                if event_path not in seen_directories:
+                    try:
+                        empty = is_directory_empty(event_path)
+                    except ValueError:
+                        # Directory vanished between the event and this
+                        # tick; nothing to register.
+                        continue
+                    if not empty:
+                        ensure_directory_registered(event_path)
+                    else:
+                        LOGGER.info("Empty directory ignored: %s", event_path)
+                    seen_directories.add(event_path)
+                continue
 
-                relative_path = os.path.relpath(file_path, folder_path)
-                destination_path = os.path.join(
-                    DESTINATION, os.path.dirname(relative_path)
-                )
+            try:
+                stat = os.stat(event_path)
+            except FileNotFoundError:
+                continue
+            fingerprint = (stat.st_mtime, stat.st_size)
+            if files_dict.get(event_path) != fingerprint:
+                updated_files[event_path] = fingerprint
 
-                os.makedirs(destination_path, exist_ok=True)
+        if updated_files:
+            LOGGER.info("Processing %d modified files...",
+                        len(updated_files))
+            # One ANY() query answers "already registered?" for the whole
+            # burst instead of a SELECT per file in the workers.
+            registered_files = db.load_registered_originals(
+                list(updated_files))
+            futures = {}
+            for file_path, fingerprint in updated_files.items():
+                LOGGER.debug("%s: %s", file_path, fingerprint)
 
                 full_dir_path = os.path.dirname(file_path)
+                destination_path = directory_info.get(full_dir_path)
+                if destination_path is None:
+                    relative_dir = os.path.relpath(full_dir_path, folder_path)
+                    destination_path = os.path.join(
+                        DESTINATION,
+                        '' if relative_dir == '.' else relative_dir
+                    )
+                    directory_info[full_dir_path] = destination_path
+
                 dir_id = ensure_directory_registered(full_dir_path)
+                if dir_id is None:
+                    # Registration failed: use a throwaway ID for this
+                    # file only; the LRU caches nothing on failure, so
+                    # the next file retries against the database.
+                    dir_id = uuid.uuid4()
+
+                if destination_path not in created_destinations:
+                    os.makedirs(destination_path, exist_ok=True)
+                    created_destinations.add(destination_path)
+
+                futures[executor.submit(
+                    preview, file_path, folder_path,
+                    destination_path, dir_id,
+                    registered=file_path in registered_files)] = file_path
 
+            children_rows = []
+            burst_errors = []
+            for future, file_path in futures.items():
                 try:
-                    preview(file_path, folder_path, destination_path, dir_id)
+                    row = future.result()
+                    if row:
+                        children_rows.append(row)
                 except Exception as exc:  # pylint: disable=broad-except
                     file_error_message = f"Error processing file {
                         file_path}: {exc}"
                     LOGGER.error(file_error_message)
-                    db.log_error_to_db(file_error_message)
+                    burst_errors.append(file_error_message)
 
+            db.save_children_batch(children_rows, burst_errors)
             files_dict.update(updated_files)
+            save_fingerprints(files_dict)
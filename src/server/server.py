@@ -28,16 +28,35 @@ Usage:
 
 import os
 import threading
-from http.server import HTTPServer
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer
 import ssl
 from src.auth.auth import AuthHTTPRequestHandler
 from src.logs.logger import LOGGER
-from src.config.config import IP_SERVER, RUN_HTTPS, CERT_FILE, KEY_FILE, SYSTEM, REPOSITORY  # noqa
+from src.config.config import IP_SERVER, RUN_HTTPS, CERT_FILE, KEY_FILE, SYSTEM, REPOSITORY, HTTP_WORKERS  # noqa
 from src.server.socket import start_websocket_server
 from src.monitor.clean import clean_schedule_task
 from src.monitor.monitor import monitor_folder
 
 
+class PooledHTTPServer(ThreadingHTTPServer):
+    """
+    HTTP server that handles requests on a bounded thread pool.
+
+    ThreadingHTTPServer spawns (and tears down) one thread per request; a
+    burst of downloads could pile up hundreds of threads. Requests are
+    instead submitted to a fixed ThreadPoolExecutor sized by HTTP_WORKERS.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.executor = ThreadPoolExecutor(max_workers=HTTP_WORKERS)
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self.process_request_thread,
+                             request, client_address)
+
+
 def start_http_server(directory, port=8000, server_name="Server"):
     """
     Starts an HTTP server serving files from the specified directory.
@@ -57,9 +76,9 @@ def start_http_server(directory, port=8000, server_name="Server"):
     """
     os.chdir(directory)
     handler = AuthHTTPRequestHandler
-    httpd = HTTPServer((IP_SERVER, int(port)), handler)
+    httpd = PooledHTTPServer((IP_SERVER, port), handler)
 
-    if RUN_HTTPS == "True":
+    if RUN_HTTPS:
         LOGGER.info("Starting HTTPS server")
         # SSL/TLS configuration using SSLContext
         context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
@@ -67,7 +86,7 @@ def start_http_server(directory, port=8000, server_name="Server"):
 
         httpd.socket = context.wrap_socket(httpd.socket, server_side=True)
 
-    mode = "HTTPS" if RUN_HTTPS == "True" else "HTTP"
+    mode = "HTTPS" if RUN_HTTPS else "HTTP"
 
     LOGGER.info("%s serving %s on %s in port %s from directory: %s",
                 server_name, mode, IP_SERVER, port, directory)
@@ -24,6 +24,10 @@ from src.config.config import SOCKET_PORT, IP_SERVER
 # Socket
 connected_clients = {}
 
+# Event loop owned by the websocket server thread; notifications from other
+# threads are scheduled onto it instead of spinning up a loop per call.
+_loop = None
+
 
 async def notify_client(client_id, message):
     """
@@ -43,6 +47,28 @@ async def notify_client(client_id, message):
         save_download_pending(client_id, message["zip_path"], True)
 
 
+def notify_client_threadsafe(client_id, message):
+    """
+    Notify a client from a non-async thread.
+
+    Schedules notify_client on the websocket server's long-lived event loop
+    and waits for the result, avoiding the cost of creating and tearing
+    down a fresh loop per notification.
+
+    Args:
+        client_id (str): The ID of the client to notify.
+        message (dict): The message to send to the client.
+
+    """
+    if _loop is None:
+        # Websocket server not started yet; run standalone as before.
+        asyncio.run(notify_client(client_id, message))
+        return
+    future = asyncio.run_coroutine_threadsafe(
+        notify_client(client_id, message), _loop)
+    future.result()
+
+
 async def websocket_handler(websocket, path):
     """
     Handle incoming WebSocket connections and messages.
@@ -68,9 +94,11 @@ def start_websocket_server():
     """
     Start the WebSocket server on IP_SERVER at port SOCKET_PORT.
     """
+    global _loop  # pylint: disable=global-statement
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
+    _loop = loop
     start_server = websockets.serve(
-        websocket_handler, IP_SERVER, int(SOCKET_PORT))
+        websocket_handler, IP_SERVER, SOCKET_PORT)
     loop.run_until_complete(start_server)
     loop.run_forever()
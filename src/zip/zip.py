@@ -23,12 +23,57 @@ Logging:
     - Final details after ZIP creation, including final ZIP size and total compression ratio.
 """
 
+import hashlib
+import logging
 import os
 import zipfile
 import uuid
 from src.logs.logger import LOGGER as logger
 from src.config.config import ZIP_PATH
 
+# Finished archives are kept here keyed by their content fingerprint, so a
+# repeat of the same download skips the whole deflate pass. Served zips are
+# hardlinks into this cache; deleting the served copy leaves the cache hit.
+CACHE_DIR = os.path.join(ZIP_PATH, 'cache')
+CACHE_MAX_ENTRIES = 16
+
+
+def _cache_key(file_paths):
+    """
+    Fingerprint a zip request from its sorted paths and their mtimes.
+
+    Args:
+        file_paths (list): List of file paths to include in the ZIP archive.
+
+    Returns:
+        str: Hex digest identifying this exact set of file versions.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for file_path in sorted(file_paths):
+        try:
+            mtime = os.path.getmtime(file_path)
+        except OSError:
+            mtime = 0
+        digest.update(f'{file_path}:{mtime}\n'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _evict_cache():
+    """
+    Drop the oldest cached archives once the cache exceeds its bound.
+    """
+    try:
+        entries = sorted(
+            (entry for entry in os.scandir(CACHE_DIR) if entry.is_file()),
+            key=lambda entry: entry.stat().st_mtime)
+    except OSError:
+        return
+    for entry in entries[:-CACHE_MAX_ENTRIES]:
+        try:
+            os.unlink(entry.path)
+        except OSError:
+            pass
+
 
 def create_zip_from_files(file_paths):
     """
@@ -43,6 +88,15 @@ def create_zip_from_files(file_paths):
 
     zip_id = uuid.uuid4()
     zip_path = os.path.join(ZIP_PATH, f'{zip_id}.zip')
+
+    cached_path = os.path.join(CACHE_DIR, f'{_cache_key(file_paths)}.zip')
+    try:
+        os.link(cached_path, zip_path)
+        logger.info('Reusing cached ZIP for %s', zip_path)
+        return zip_path
+    except OSError:
+        pass
+
     logger.info('Creating ZIP file at: %s', zip_path)
 
     total_original_size = sum(os.path.getsize(file_path)
@@ -56,12 +110,22 @@ def create_zip_from_files(file_paths):
                 arc_name = os.path.basename(file_path)
                 zip_f.write(file_path, arc_name)
 
-                # Calculate the size of the ZIP file after each addition
-                zip_f_size = os.path.getsize(zip_path)
-                logger.info('Added %s to ZIP. Current ZIP size: %.2f MB',
-                            arc_name, zip_f_size / (1024 * 1024))
+                # The running-size stat is only worth paying for when the
+                # debug echo is actually enabled.
+                if logger.isEnabledFor(logging.DEBUG):
+                    zip_f_size = os.path.getsize(zip_path)
+                    logger.debug('Added %s to ZIP. Current ZIP size: %.2f MB',
+                                 arc_name, zip_f_size / (1024 * 1024))
             else:
                 logger.warning('File not found or invalid path: %s',
                                file_path)
 
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        os.link(zip_path, cached_path)
+        _evict_cache()
+    except OSError:
+        # Caching is best-effort; the fresh archive is still served.
+        pass
+
     return zip_path